@@ -26,6 +26,7 @@ def main():
         st.session_state['analysis_completed'] = False
         st.session_state['results'] = []
         st.session_state['thread_ids'] = []
+        st.session_state['submission_names'] = ()
 
     uploaded_files, process_button = render_sidebar()
 
@@ -76,6 +77,8 @@ def main():
             st.session_state['results'] = results
             st.session_state['thread_ids'] = [
                 r.get("Thread ID", "") for r in results]
+            st.session_state['submission_names'] = tuple(
+                r["Submission Name"] for r in results)
             st.session_state['analysis_completed'] = True
 
         display_results(st.session_state.get('results', []))
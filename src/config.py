@@ -26,6 +26,23 @@ AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT", "")
 AZURE_OPENAI_KEY = os.getenv("AZURE_OPENAI_KEY", "")
 AZURE_OPENAI_DEPLOYMENT_NAME = os.getenv(
     "AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini")
+AZURE_OPENAI_CONFIGURED = bool(AZURE_OPENAI_KEY and AZURE_OPENAI_ENDPOINT)
+
+# Concurrency Configuration
+# Submission analysis is network-bound, so allow several requests per core.
+MAX_CONCURRENT_REQUESTS = int(os.getenv(
+    "MAX_CONCURRENT_REQUESTS", str(min(32, (os.cpu_count() or 1) * 5))))
+
+# Analysis Cache Configuration
+# Seconds an analysis is reused for identical submission text. Entries also
+# expire so criteria changed outside this instance are eventually picked up.
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+
+# Follow-up Question Cache Configuration
+# Generated questions persist on disk so restarts and other users reuse them.
+FOLLOWUP_CACHE_DIR = os.getenv("FOLLOWUP_CACHE_DIR", ".followup_cache")
+FOLLOWUP_CACHE_SIZE_LIMIT = int(os.getenv(
+    "FOLLOWUP_CACHE_SIZE_LIMIT", str(100 * 1024 * 1024)))
 
 # Streamlit page configuration
 
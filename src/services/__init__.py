@@ -1,21 +1,39 @@
 """
 Services package for the SoCa (Submission over Criteria) Analysis Tool.
-Contains modules for API communication, blob storage, and text extraction.
+Contains modules for API communication, Azure OpenAI, and text extraction.
 """
 
-from services.api_client import APIClient
+from services.api_client import APIClient, analyze_submission
 from services.text_extraction import (
     extract_text_from_file,
     extract_text_from_pdf,
     extract_text_from_docx
 )
-from services.openai_client import summarize_submission_analyses, generate_followup_questions
+from services.openai_client import (
+    get_openai_client,
+    extract_analysis_fields,
+    summarize_submission_analyses,
+    summarize_and_generate_followups,
+    generate_followup_questions,
+    generate_followups_bulk,
+    generate_followup_questions_batch,
+    stream_submission_summary,
+    stream_followup_questions
+)
 
 __all__ = [
     'APIClient',
+    'analyze_submission',
+    'get_openai_client',
     'extract_text_from_file',
     'extract_text_from_pdf',
     'extract_text_from_docx',
+    'extract_analysis_fields',
     'summarize_submission_analyses',
-    'generate_followup_questions'
+    'summarize_and_generate_followups',
+    'generate_followup_questions',
+    'generate_followups_bulk',
+    'generate_followup_questions_batch',
+    'stream_submission_summary',
+    'stream_followup_questions'
 ]
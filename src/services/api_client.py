@@ -4,12 +4,36 @@ Handles authentication, CV submission, and feedback submission.
 """
 
 import streamlit as st
-import requests
 import json
+import logging
+import orjson
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-from config import API_BASE_URL, API_USERNAME, API_PASSWORD, DEFAULT_REVISION_ID
+from config import API_BASE_URL, API_USERNAME, API_PASSWORD, DEFAULT_REVISION_ID, ANALYSIS_CACHE_TTL
+from services.http import get_http_session, retry_unsent_requests
+
+logger = logging.getLogger(__name__)
+
+
+# Timeouts (in seconds) for FastAgent API requests. Analysis runs several
+# agents before replying, so its read timeout is generous.
+ANALYSIS_REQUEST_TIMEOUT = 300
+FEEDBACK_REQUEST_TIMEOUT = 30
+
+
+@retry_unsent_requests
+def _post_with_retry(url: str, payload: Dict[str, Any], auth: Tuple[str, str]) -> Dict[str, Any]:
+    """
+    POST a JSON payload, retrying rate limiting and failures to connect.
+
+    Requests the server may already have accepted are not retried, since
+    each analysis request starts a new analysis.
+    """
+    response = get_http_session().post(
+        url, json=payload, auth=auth, timeout=ANALYSIS_REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
 class APIClient:
@@ -20,7 +44,12 @@ class APIClient:
 
     @classmethod
     def create_chat(cls, cv_content: str, thread_id: Optional[str] = None, identifier: Optional[str] = None) -> Dict[str, Any]:
-        """Send a CV for analysis and get the results."""
+        """
+        Send a CV for analysis and get the results.
+
+        Runs on worker threads, so errors are logged and returned under an
+        "error" key for the caller to show rather than displayed here.
+        """
         url = f"{API_BASE_URL}/chat"
 
         # Format the CV content as required by the API
@@ -42,11 +71,9 @@ class APIClient:
         try:
             # Use basic authentication from environment variables
             auth = (API_USERNAME, API_PASSWORD)
-            response = requests.post(url, json=payload, auth=auth)
-            response.raise_for_status()
-            return response.json()
+            return _post_with_retry(url, payload, auth)
         except Exception as e:
-            st.error(f"API Error: {str(e)}")
+            logger.warning("Analysis API error: %s", e)
             return {"error": str(e)}
 
     @classmethod
@@ -64,9 +91,33 @@ class APIClient:
         try:
             # Use basic authentication
             auth = (API_USERNAME, API_PASSWORD)
-            response = requests.put(url, json=payload, auth=auth)
+            response = get_http_session().put(
+                url, json=payload, auth=auth, timeout=FEEDBACK_REQUEST_TIMEOUT)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             st.error(f"API Error: {str(e)}")
             return {"error": str(e)}
+
+
+@st.cache_data(show_spinner=False, max_entries=100, ttl=ANALYSIS_CACHE_TTL)
+def analyze_submission(submission_text: str, _identifier: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Send a submission's text for analysis, reusing the result for identical text.
+
+    Cached on the text only (Streamlit does not hash underscore-prefixed
+    arguments), so re-running an analysis of unchanged uploads does not call
+    the API again. Failed calls raise instead of being cached. Entries expire
+    after ANALYSIS_CACHE_TTL seconds, and this instance clears the cache with
+    analyze_submission.clear() when it updates the criteria.
+
+    The cache is shared by all sessions: users who upload the same document
+    within the TTL see the same analysis thread, so their feedback is
+    recorded against the same message. This is intended, as the analysis
+    they rate is identical.
+    """
+    response = APIClient.create_chat(submission_text, identifier=_identifier)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+
+    return response
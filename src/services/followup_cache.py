@@ -0,0 +1,66 @@
+"""
+Disk-backed cache of generated follow-up questions.
+
+Questions are keyed on the exact prompt they were generated from, so they
+survive Streamlit reruns and server restarts, are shared by every user who
+analyzes the same submission, and stop being served once the prompt changes.
+Entries are derived from candidates' documents, so they expire after the
+same ANALYSIS_CACHE_TTL as the analyses they came from.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+import diskcache
+import orjson
+import streamlit as st
+
+from config import (
+    ANALYSIS_CACHE_TTL,
+    AZURE_OPENAI_DEPLOYMENT_NAME,
+    FOLLOWUP_CACHE_DIR,
+    FOLLOWUP_CACHE_SIZE_LIMIT
+)
+
+
+@st.cache_resource
+def _get_cache() -> diskcache.Cache:
+    """Get the shared follow-up question cache, evicting least recently used entries."""
+    return diskcache.Cache(
+        FOLLOWUP_CACHE_DIR,
+        size_limit=FOLLOWUP_CACHE_SIZE_LIMIT,
+        eviction_policy="least-recently-used"
+    )
+
+
+def _cache_key(messages: List[Dict[str, str]]) -> str:
+    """Hash the prompt messages, and the model they are sent to, into a cache key."""
+    key_source = orjson.dumps([AZURE_OPENAI_DEPLOYMENT_NAME, messages])
+    return hashlib.blake2b(key_source, digest_size=16).hexdigest()
+
+
+def get_cached_followups(messages: List[Dict[str, str]]) -> Optional[str]:
+    """
+    Look up follow-up questions generated from a prompt.
+
+    Args:
+        messages: System and user messages the questions were generated from
+
+    Returns:
+        The cached questions, or None if there are none
+    """
+    return _get_cache().get(_cache_key(messages))
+
+
+def store_followups(messages: List[Dict[str, str]], questions: str):
+    """
+    Cache follow-up questions generated from a prompt.
+
+    Only store questions that were generated successfully; failures must
+    not be cached.
+
+    Args:
+        messages: System and user messages the questions were generated from
+        questions: Generated follow-up questions
+    """
+    _get_cache().set(_cache_key(messages), questions, expire=ANALYSIS_CACHE_TTL)
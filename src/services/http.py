@@ -0,0 +1,101 @@
+"""
+Shared HTTP helpers for the SoCa (Submission over Criteria) Analysis Tool.
+Provides the shared HTTP session and the retry policy used for calls to the
+analysis and Azure OpenAI APIs.
+"""
+
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential
+)
+
+from config import MAX_CONCURRENT_REQUESTS
+
+# Retry policy for rate limiting (429) and transient server errors
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRY_ATTEMPTS = 3
+MAX_RETRY_WAIT = 20
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all API clients.
+
+    The session keeps connections alive so TCP and TLS setup is paid once and
+    reused across requests, worker threads and Streamlit reruns. Retries are
+    left to retry_transient_errors rather than the adapter, so a failed
+    request is not retried twice.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, MAX_CONCURRENT_REQUESTS))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Check whether a failed request is worth retrying."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS_CODES
+    # A read timeout means the server accepted the request and is still
+    # working on it; retrying would pay for the same slow generation again
+    if isinstance(error, requests.ReadTimeout):
+        return False
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def _is_unsent_request_error(error: BaseException) -> bool:
+    """Check whether a request failed before the server could have acted on it."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code == 429
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError):
+        # requests wraps urllib3's MaxRetryError, whose reason says whether
+        # the connection was ever established
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+_exponential_backoff = wait_random_exponential(multiplier=1, max=MAX_RETRY_WAIT)
+
+
+def _wait_before_retry(retry_state: RetryCallState) -> float:
+    """Wait as long as the server's Retry-After header asks, else back off with jitter."""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+
+    try:
+        return min(float(retry_after), MAX_RETRY_WAIT)
+    except (TypeError, ValueError):
+        return _exponential_backoff(retry_state)
+
+
+# Decorator for functions that send a request and call raise_for_status():
+# retries rate limiting, transient server errors and connection failures with
+# exponential backoff, then re-raises the last error.
+retry_transient_errors = retry(
+    retry=retry_if_exception(_is_transient_error),
+    wait=_wait_before_retry,
+    stop=stop_after_attempt(MAX_RETRY_ATTEMPTS),
+    reraise=True
+)
+
+# Decorator for non-idempotent requests, where a retry after the server has
+# accepted the request would repeat its side effects: retries only rate
+# limiting and failures to connect, then re-raises the last error.
+retry_unsent_requests = retry(
+    retry=retry_if_exception(_is_unsent_request_error),
+    wait=_wait_before_retry,
+    stop=stop_after_attempt(MAX_RETRY_ATTEMPTS),
+    reraise=True
+)
@@ -0,0 +1,73 @@
+"""
+Typed models for analysis responses returned by the FastAgent API.
+
+The API serializes its objects with their attributes nested under "__dict__"
+keys. These models unwrap that structure once so callers can use attributes.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+def _attributes(data: Any) -> Dict[str, Any]:
+    """Get the attributes of a serialized API object, or an empty dict."""
+    if not isinstance(data, dict):
+        return {}
+    attributes = data.get("__dict__", data)
+    return attributes if isinstance(attributes, dict) else {}
+
+
+@dataclass(frozen=True)
+class ChatMessage:
+    """A message produced by one of the analysis agents."""
+
+    content: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "ChatMessage":
+        """Build a message from its serialized form."""
+        return cls(content=_attributes(data).get("content") or "")
+
+
+@dataclass(frozen=True)
+class ChatResponse:
+    """An agent's response to a chat."""
+
+    chat_message: ChatMessage
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "ChatResponse":
+        """Build a response from its serialized form."""
+        # chat_response itself is not wrapped in "__dict__" by the API
+        return cls(chat_message=ChatMessage.from_dict(
+            data.get("chat_message") if isinstance(data, dict) else None))
+
+
+@dataclass(frozen=True)
+class AnalysisHeader:
+    """One named chat in an analysis, such as the summary."""
+
+    chat_name: str
+    chat_response: ChatResponse
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "AnalysisHeader":
+        """Build a header from its serialized form."""
+        attributes = _attributes(data)
+        return cls(
+            chat_name=attributes.get("chat_name") or "",
+            chat_response=ChatResponse.from_dict(attributes.get("chat_response"))
+        )
+
+
+def parse_analysis_headers(analysis_data: List[Any]) -> List[AnalysisHeader]:
+    """
+    Convert parsed analysis JSON into typed headers.
+
+    Args:
+        analysis_data: Parsed analysis JSON returned by the API
+
+    Returns:
+        One header per chat, in response order
+    """
+    return [AnalysisHeader.from_dict(header) for header in analysis_data]
@@ -4,10 +4,192 @@ Azure OpenAI client for summarizing multiple submission analyses and generating
 
 import streamlit as st
 import requests
-import json
-from typing import List, Dict, Any, Optional
+import hashlib
+import logging
+import orjson
+import re
+import threading
+import time
+import tiktoken
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
 
 from config import AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_KEY, AZURE_OPENAI_DEPLOYMENT_NAME
+from services.http import get_http_session, retry_transient_errors
+from services.followup_cache import get_cached_followups, store_followups
+from services.models import parse_analysis_headers
+
+logger = logging.getLogger(__name__)
+
+# Timeout (in seconds) for Azure OpenAI requests
+REQUEST_TIMEOUT = 60
+
+# Timeout (in seconds) for the combined summary and follow-up request. It is
+# not streamed, so no bytes arrive until its long completion is finished.
+COMBINED_REQUEST_TIMEOUT = 300
+
+# Token budgets for prompts that include several analyses. Each analysis is
+# clipped to its share of the total so many submissions fit the context window.
+MAX_ANALYSIS_TOKENS = 1500
+MAX_MULTI_ANALYSIS_PROMPT_TOKENS = 60000
+
+# Rough characters-per-token ratio, used if no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Seconds to wait before retrying a failed tokenizer load
+ENCODING_RETRY_INTERVAL = 300
+
+# Chats in an analysis response whose content is used in OpenAI prompts
+ANALYSIS_CHAT_NAMES = ("summary", "applicant_lookup_agent")
+
+# Number of completions kept in the client's prompt-keyed cache
+MAX_CACHED_COMPLETIONS = 256
+
+# Upper bound on concurrent Azure OpenAI requests, to stay within rate limits
+MAX_CONCURRENT_COMPLETIONS = 10
+
+# Output budget for the combined summary and follow-up request. A reply cut
+# off at max_tokens is invalid JSON, so above MAX_COMBINED_SUBMISSIONS the
+# request is not attempted and callers use separate requests instead.
+MAX_COMBINED_OUTPUT_TOKENS = 16000
+COMBINED_SUMMARY_TOKENS = 2000
+FOLLOWUP_TOKENS_PER_SUBMISSION = 1500
+MAX_COMBINED_SUBMISSIONS = (MAX_COMBINED_OUTPUT_TOKENS - COMBINED_SUMMARY_TOKENS) \
+    // FOLLOWUP_TOKENS_PER_SUBMISSION
+
+# Most submissions whose follow-up questions fit in one batched request
+MAX_FOLLOWUP_BATCH_SIZE = MAX_COMBINED_OUTPUT_TOKENS // FOLLOWUP_TOKENS_PER_SUBMISSION
+
+# Stable instruction block shared by every prompt. Azure OpenAI caches
+# repeated prompt prefixes of 1024+ tokens, so this text must stay first,
+# stay byte-for-byte identical between calls, and stay above that length.
+# Task-specific instructions follow it, and per-request data goes last.
+_SYSTEM_PROMPT_STABLE = """You are an AI assistant for the SoCa (Submission over Criteria) tool. SoCa helps reviewers evaluate written submissions, such as CVs, resumes, proposals and applications, against a defined set of criteria. Each submission has already been assessed by an upstream analysis agent, and you work only from those assessments.
+
+## Your role
+
+- You support human reviewers; you never make the decision for them.
+- You describe what the analyses say about each submission, clearly and accurately.
+- You point out where evidence is strong, where it is thin, and where it is missing.
+- You write in a professional, neutral and concise tone suitable for sharing with a selection panel.
+
+## Input format
+
+Each submission is provided as:
+
+Submission: <file name of the submission>
+Analysis: <markdown produced by the analysis agent>
+
+The analysis usually contains an overall summary, a detailed evaluation grouped by criterion, and a scoring table using a 1 to 5 scale, where 1 means the criterion is not demonstrated and 5 means it is strongly demonstrated with clear evidence. Some analyses also include information gathered about the applicant from other sources. Analyses may be incomplete; if a section is missing, say so rather than guessing.
+
+## Scoring scale used by the analyses
+
+- 1: The criterion is not demonstrated, or the submission contradicts it.
+- 2: The criterion is mentioned but with little or no supporting evidence.
+- 3: The criterion is partly demonstrated; evidence exists but is limited in depth, recency or relevance.
+- 4: The criterion is clearly demonstrated with specific, relevant evidence.
+- 5: The criterion is strongly demonstrated with specific, recent and substantial evidence, often exceeding the stated requirement.
+
+When you report scores, reproduce them exactly as given in the analyses. Never re-score a submission, never average scores into a single total, and never use scores to order submissions.
+
+## Principles you must follow
+
+1. Objectivity. Base every statement on the content of the analyses. Do not invent qualifications, employers, dates, scores or achievements.
+2. No ranking. Never rank submissions, never name a preferred or "best" submission, and never recommend which submission should be selected. Do not use comparative value words such as "stronger", "weaker", "superior" or "better suited" when contrasting submissions.
+3. Fairness. Ignore and never comment on personal characteristics that are irrelevant to the criteria, including age, gender, ethnicity, nationality, religion, marital or family status, disability, or the prestige of a name or institution beyond what the criteria require.
+4. Evidence. When you refer to a skill or experience, tie it to the evidence described in the analysis. If a score is given without supporting evidence, note that the evidence is limited.
+5. Consistency. Use the same criterion names across all submissions so that reviewers can compare like with like. If analyses use different names for the same criterion, use the clearest common name.
+6. Brevity. Prefer short sentences and bullet points. Avoid repeating the same point in several sections.
+7. Uncertainty. Where the analyses disagree with each other or are ambiguous, say so explicitly and suggest what information would resolve it.
+
+## Formatting conventions
+
+- Write in GitHub-flavoured markdown.
+- Use level-3 headings (###) for major sections and level-4 headings (####) for sub-sections.
+- Use markdown tables for side-by-side information. Keep table cells short; put longer explanations below the table.
+- Refer to submissions by their file name without the extension, for example "Emily_Johnson" for "Emily_Johnson.pdf".
+- Do not include any preamble such as "Sure, here is" and do not include closing remarks offering further help.
+
+## Example comparative analysis
+
+The following example shows the expected structure and register for a comparative analysis of two submissions. Content will differ for real submissions.
+
+### Overview
+Both submissions address the technical, experience, education and communication criteria. They differ mainly in the breadth of front-end experience and in leadership exposure.
+
+### Comparison Table
+
+| Criteria | John_Smith | Jane_Doe |
+|----------------------|------------------------------------------|------------------------------------------|
+| Technical Skills | Python, JavaScript, React, Flask (5) | Python, Django, PostgreSQL (4) |
+| Experience | 7 years, led a team of junior developers | 4 years, individual contributor |
+| Education | BSc Computer Science | MSc Data Science |
+| Communication Skills | Clear descriptions of achievements (4) | Concise, well structured (4) |
+
+### Similarities
+- Both demonstrate production Python experience backed by specific projects.
+- Both meet the minimum education requirement.
+
+### Differences
+- John_Smith describes front-end work in React; Jane_Doe's analysis does not mention front-end experience.
+- Jane_Doe's analysis highlights database design; John_Smith's analysis does not cover it.
+- Only John_Smith's analysis mentions people leadership.
+
+### Gaps in Evidence
+- Neither analysis provides evidence of cloud deployment experience, which the criteria list as desirable.
+
+## Example follow-up questions
+
+The following example shows the expected structure and register for follow-up questions about a single submission.
+
+1. **Can you walk us through a RESTful API you designed with Flask, including how you handled authentication?**
+   *Why ask:* The analysis mentions API work but gives no detail about design decisions or security.
+2. **What did leading a team of junior developers involve day to day?**
+   *Why ask:* Leadership is mentioned without describing scope, team size or outcomes.
+"""
+
+# Task instructions appended to the stable prefix for comparative analyses
+COMPARISON_INSTRUCTIONS = """## Current task: comparative analysis
+
+Provide an objective comparative analysis of the submissions based on their qualifications, experience, and skills. Create a table comparing key aspects across all submissions. DO NOT rank the submissions or suggest which one is better than others. The analysis should only highlight differences and similarities in an objective manner."""
+
+# Task instructions appended to the stable prefix for follow-up questions
+FOLLOWUP_INSTRUCTIONS = """## Current task: follow-up questions
+
+Generate 5 tailored follow-up questions for the submission. Your questions should help gather additional information, clarify details, and better understand the submission's content. Be specific, professional, and conversational.
+
+Please include:
+1. Questions that clarify points that need more explanation or context
+2. Questions about specific experiences or skills mentioned that would benefit from elaboration
+3. Questions about areas where the submission might have relevant content not mentioned
+4. Questions that help understand the intentions, goals, and motivations behind the submission
+5. Questions about preferences or additional details that would enhance understanding of the submission
+
+Format the questions as a numbered list with brief explanations for why each question is important to ask."""
+
+# Output format appended to the follow-up instructions when several
+# submissions are handled in one request
+FOLLOWUP_BATCH_INSTRUCTIONS = """## Output format for multiple submissions
+
+The user message contains several submissions, each introduced by a heading of the form "## Submission <number>: <name>". Generate a separate set of follow-up questions for every submission. Start each set with a delimiter line of the form "=== Submission <number> ===" on its own line, using the submission's number, followed by that submission's questions. Do not write anything before the first delimiter and do not skip any submission."""
+
+# Output format for a single request covering the comparison and all follow-ups
+COMBINED_OUTPUT_INSTRUCTIONS = """## Output format for the combined task
+
+Complete both tasks above in one response. Respond with a single JSON object and nothing else, using exactly these keys:
+
+- "summary": the comparative analysis of all submissions, as a markdown string
+- "followups": an object with one entry per submission, whose key is the submission name exactly as given after "Submission:" and whose value is that submission's follow-up questions as a markdown string
+
+As an exception to the convention of dropping file extensions, keep the extension in the "followups" keys, for example "Emily_Johnson.pdf"."""
+
+# File extensions of supported submissions, ignored when matching names
+_SUBMISSION_EXTENSION = re.compile(r"\.(pdf|docx|txt|md|json)$", re.IGNORECASE)
+
+# Delimiter line separating per-submission blocks in a batched response
+_BATCH_DELIMITER = re.compile(r"^=== Submission (\d+) ===[ \t]*$", re.MULTILINE)
 
 
 class AzureOpenAIClient:
@@ -20,10 +202,59 @@ class AzureOpenAIClient:
         self.api_key = api_key
         self.deployment_name = deployment_name
 
+        # Completions keyed by a hash of the request, least recently used first
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _cache_key(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        """Hash the parts of a request that determine its completion."""
+        canonical = orjson.dumps(
+            [self.deployment_name, messages, temperature, max_tokens])
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+    def _get_cached(self, key: str) -> Optional[str]:
+        """Look up a cached completion, marking it as recently used."""
+        with self._cache_lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+    def _store_cached(self, key: str, content: str):
+        """Cache a completion, evicting the least recently used beyond the limit."""
+        with self._cache_lock:
+            self._cache[key] = content
+            self._cache.move_to_end(key)
+            while len(self._cache) > MAX_CACHED_COMPLETIONS:
+                self._cache.popitem(last=False)
+
+    @retry_transient_errors
+    def _post_completion(self, payload: Dict[str, Any], stream: bool = False,
+                         timeout: float = REQUEST_TIMEOUT) -> requests.Response:
+        """
+        Post a payload to the Chat Completion API and return the raw response.
+
+        Rate limiting and transient server errors are retried with backoff.
+        """
+        url = f"{self.endpoint}/openai/deployments/{self.deployment_name}/chat/completions?api-version=2023-12-01-preview"
+
+        headers = {
+            "Content-Type": "application/json",
+            "api-key": self.api_key
+        }
+
+        response = get_http_session().post(
+            url, headers=headers, json=payload, stream=stream, timeout=timeout)
+        response.raise_for_status()
+        return response
+
     def get_chat_completion(self,
                             messages: List[Dict[str, str]],
                             temperature: float = 0.7,
-                            max_tokens: int = 2000) -> Optional[str]:
+                            max_tokens: int = 2000,
+                            use_cache: bool = True,
+                            response_format: Optional[Dict[str, str]] = None,
+                            timeout: float = REQUEST_TIMEOUT) -> Optional[str]:
         """
         Send a request to Azure OpenAI Chat Completion API.
 
@@ -31,74 +262,285 @@ class AzureOpenAIClient:
             messages: List of message dictionaries with 'role' and 'content'
             temperature: Controls randomness (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
+            use_cache: Return a cached completion for an identical request if
+                available; a fresh completion always replaces the cached one
+            response_format: Optional response format, such as
+                {"type": "json_object"} to require a JSON reply
+            timeout: Seconds to wait for the response; raise this for
+                long completions, which send nothing until they finish
 
         Returns:
             Generated content or None if there was an error
         """
-        url = f"{self.endpoint}/openai/deployments/{self.deployment_name}/chat/completions?api-version=2023-12-01-preview"
-
-        headers = {
-            "Content-Type": "application/json",
-            "api-key": self.api_key
-        }
+        cache_key = self._cache_key(messages, temperature, max_tokens)
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
 
         payload = {
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
         }
+        if response_format:
+            payload["response_format"] = response_format
 
         try:
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
+            response_data = orjson.loads(self._post_completion(payload, timeout=timeout).content)
 
             if "choices" in response_data and len(response_data["choices"]) > 0:
-                return response_data["choices"][0]["message"]["content"]
+                content = response_data["choices"][0]["message"]["content"]
+                if content:
+                    self._store_cached(cache_key, content)
+                return content
             else:
-                error_msg = "Failed to generate content. The API did not return expected response."
-                st.error(error_msg)
+                logger.warning(
+                    "Azure OpenAI did not return the expected response: %s", response_data)
                 return None
         except Exception as e:
-            st.error(f"Azure OpenAI API Error: {str(e)}")
+            # Completions are requested from worker threads, which cannot
+            # display errors; callers report the None result instead
+            logger.warning("Azure OpenAI API error: %s", e)
             return None
 
+    def stream_chat_completion(self,
+                               messages: List[Dict[str, str]],
+                               temperature: float = 0.7,
+                               max_tokens: int = 2000,
+                               use_cache: bool = True) -> Iterator[str]:
+        """
+        Stream a response from Azure OpenAI Chat Completion API.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            use_cache: Yield a cached completion for an identical request if
+                available; a fresh completion always replaces the cached one
+
+        Yields:
+            Content fragments as they are generated
+
+        Returns:
+            The full completion, or None if the response had no content
+
+        Raises:
+            Exception: If the request fails or the stream is cut off; any
+                fragments already yielded are incomplete and are not cached
+        """
+        cache_key = self._cache_key(messages, temperature, max_tokens)
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                yield cached
+                return cached
+
+        payload = {
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+
+        parts = []
+
+        try:
+            with self._post_completion(payload, stream=True) as response:
+                # Read raw bytes: event streams are UTF-8, but requests would
+                # decode a response without a charset as ISO-8859-1
+                for line in response.iter_lines():
+                    # Server-sent events: payload lines look like "data: {...}"
+                    if not line or not line.startswith(b"data:"):
+                        continue
+
+                    data = line[len(b"data:"):].strip()
+                    if data == b"[DONE]":
+                        break
+
+                    # Azure sends content filter results in chunks with no choices
+                    for choice in orjson.loads(data).get("choices", []):
+                        content = choice.get("delta", {}).get("content")
+                        if content:
+                            parts.append(content)
+                            yield content
+        except Exception as e:
+            # Let the caller know the output is truncated rather than
+            # ending the stream as if it had completed
+            raise RuntimeError(f"Azure OpenAI API Error: {str(e)}") from e
+
+        # Only cache completions that streamed to the end
+        if not parts:
+            return None
+
+        completion = "".join(parts)
+        self._store_cached(cache_key, completion)
+        return completion
+
+
+@st.cache_resource
+def get_openai_client() -> AzureOpenAIClient:
+    """Get the shared Azure OpenAI client, reused across calls and reruns."""
+    return AzureOpenAIClient()
+
+
+def _index_chat_contents(analysis_data: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Index the message content of every chat in a parsed analysis by chat name.
+
+    Args:
+        analysis_data: Parsed analysis JSON returned by the API
+
+    Returns:
+        Non-empty message contents keyed by chat name, in response order
+    """
+    by_name = {}
+
+    for header in parse_analysis_headers(analysis_data):
+        content = header.chat_response.chat_message.content
+        if content:
+            by_name.setdefault(header.chat_name, []).append(content)
+
+    return by_name
+
+
+def extract_analysis_fields(raw_analysis: str) -> Dict[str, str]:
+    """
+    Parse a raw analysis once and extract the text used for display and prompts.
+
+    Args:
+        raw_analysis: Raw analysis JSON returned by the API
+
+    Returns:
+        Dictionary with the summary markdown shown to the user ("SummaryMarkdown")
+        and the analysis text used in OpenAI prompts ("AnalysisText")
+    """
+    try:
+        by_name = _index_chat_contents(orjson.loads(raw_analysis))
+    except Exception:
+        # Fallback to raw analysis if the response is not in the expected format
+        return {"SummaryMarkdown": raw_analysis, "AnalysisText": raw_analysis}
+
+    summary = by_name.get("summary", [])
+    analysis = [content for chat_name in ANALYSIS_CHAT_NAMES
+                for content in by_name.get(chat_name, [])]
+
+    return {
+        "SummaryMarkdown": "\n\n".join(summary),
+        # If we couldn't extract formatted content, use the raw analysis
+        "AnalysisText": "".join(content + "\n" for content in analysis) or raw_analysis
+    }
+
+
+@lru_cache(maxsize=256)
+def _extract_analysis_text(raw_analysis: str) -> str:
+    """
+    Extract formatted analysis content from a raw analysis JSON string.
+
+    Cached on the raw string so repeated prompt builds for the same
+    analysis do not parse the JSON again.
+
+    Args:
+        raw_analysis: Raw analysis JSON returned by the API
+
+    Returns:
+        Extracted analysis text
+    """
+    return extract_analysis_fields(raw_analysis)["AnalysisText"]
+
 
 def extract_analysis_content(analysis: Dict[str, Any]) -> str:
     """
     Extract formatted analysis content from submission analysis data.
 
+    Uses the text extracted at ingest time when the analysis carries it.
+
     Args:
         analysis: Dictionary containing submission analysis data
 
     Returns:
         Extracted analysis text
     """
+    if "AnalysisText" in analysis:
+        return analysis["AnalysisText"]
+
+    return _extract_analysis_text(analysis.get("Analysis", "No analysis available"))
+
+
+@lru_cache(maxsize=1)
+def _load_encoding() -> tiktoken.Encoding:
+    """
+    Load the tokenizer for the configured deployment.
+
+    Only successful loads are cached; failures raise, so a later call can
+    try again.
+    """
     try:
-        analysis_text = ""
-        analysis_data = json.loads(analysis.get("Analysis", "{}"))
+        return tiktoken.encoding_for_model(AZURE_OPENAI_DEPLOYMENT_NAME)
+    except KeyError:
+        # Deployment names need not match model names; use the GPT-4o encoding
+        return tiktoken.get_encoding("o200k_base")
 
-        for header in analysis_data:
-            chat_dict = header.get('__dict__', {})
-            chat_name = chat_dict.get('chat_name', '')
 
-            if chat_name in ["summary", "applicant_lookup_agent"]:
-                chat_response = chat_dict.get('chat_response', {})
-                chat_message = chat_response.get('chat_message', {})
-                content = chat_message.get('__dict__', {}).get('content', '')
+# Monotonic time of the last failed tokenizer load, if it has not loaded since
+_encoding_failed_at: Optional[float] = None
 
-                if content:
-                    analysis_text += content + "\n"
 
-        # If we couldn't extract formatted content, use the raw analysis
-        if not analysis_text:
-            analysis_text = analysis.get("Analysis", "No analysis available")
+def _get_encoding() -> Optional[tiktoken.Encoding]:
+    """
+    Get the tokenizer for the configured deployment, or None if unavailable.
 
-    except Exception:
-        # Fallback to raw analysis if JSON parsing fails
-        analysis_text = analysis.get("Analysis", "No analysis available")
+    tiktoken downloads its encoding files on first use. If that fails, the
+    character-based estimate is used and the load is retried after
+    ENCODING_RETRY_INTERVAL seconds rather than on every prompt.
+    """
+    global _encoding_failed_at
+
+    if _encoding_failed_at is not None and \
+            time.monotonic() - _encoding_failed_at < ENCODING_RETRY_INTERVAL:
+        return None
+
+    try:
+        encoding = _load_encoding()
+    except Exception as e:
+        logger.warning("Could not load tokenizer, estimating token counts: %s", e)
+        _encoding_failed_at = time.monotonic()
+        return None
+
+    _encoding_failed_at = None
+    return encoding
+
+
+def _clip_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most max_tokens tokens, keeping the beginning.
+
+    Analyses lead with their summary and scores, so the start is the most
+    relevant part to keep.
+
+    Args:
+        text: Text to clip
+        max_tokens: Maximum number of tokens to keep
+
+    Returns:
+        The text, truncated with a marker if it was over budget
+    """
+    encoding = _get_encoding()
+
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        return text if len(text) <= max_chars else text[:max_chars] + "\n[...truncated]"
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+
+    return encoding.decode(tokens[:max_tokens]) + "\n[...truncated]"
 
-    return analysis_text
+
+def _analysis_token_budget(count: int) -> int:
+    """Get the per-analysis token budget for a prompt containing count analyses."""
+    return min(MAX_ANALYSIS_TOKENS, MAX_MULTI_ANALYSIS_PROMPT_TOKENS // max(count, 1))
 
 
 def build_comparison_prompt(analyses: List[Dict[str, Any]]) -> str:
@@ -111,17 +553,17 @@ def build_comparison_prompt(analyses: List[Dict[str, Any]]) -> str:
     Returns:
         Formatted prompt for OpenAI
     """
-    prompt = "Please provide a comparative analysis of the following submission analyses:\n\n"
+    prompt = "Submission analyses to compare:\n\n"
+    token_budget = _analysis_token_budget(len(analyses))
 
     for analysis in analyses:
         submission_name = analysis.get("Submission Name", "Unnamed Submission")
-        analysis_text = extract_analysis_content(analysis)
+        analysis_text = _clip_to_tokens(
+            extract_analysis_content(analysis), token_budget)
 
         prompt += f"Submission: {submission_name}\n"
         prompt += f"Analysis: {analysis_text}\n\n"
 
-    prompt += "Please provide an objective comparative analysis of the submissions based on their qualifications, experience, and skills. Create a table comparing key aspects across all submissions. DO NOT rank the submissions or suggest which one is better than others. The analysis should only highlight differences and similarities in an objective manner."
-
     return prompt
 
 
@@ -138,83 +580,382 @@ def build_followup_questions_prompt(analysis: Dict[str, Any]) -> str:
     submission_name = analysis.get("Submission Name", "Unnamed Submission")
     analysis_text = extract_analysis_content(analysis)
 
-    prompt = f"""Generate 5 tailored follow-up questions for the submission based on the following analysis:
-
-Submission: {submission_name}
+    prompt = f"""Submission: {submission_name}
 Analysis: {analysis_text}
-
-Please include:
-1. Questions that clarify points that need more explanation or context
-2. Questions about specific experiences or skills mentioned that would benefit from elaboration 
-3. Questions about areas where the submission might have relevant content not mentioned 
-4. Questions that help understand the intentions, goals, and motivations behind the submission
-5. Questions about preferences or additional details that would enhance understanding of the submission
-
-Format the questions as a numbered list with brief explanations for why each question is important to ask.
 """
 
     return prompt
 
 
-def generate_followup_questions(analysis: Dict[str, Any]) -> str:
+def build_followup_questions_messages(analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for generating follow-up questions.
+
+    Args:
+        analysis: Dictionary containing submission analysis data
+
+    Returns:
+        System and user messages for OpenAI
+    """
+    system_message = {
+        "role": "system",
+        "content": f"{_SYSTEM_PROMPT_STABLE}\n{FOLLOWUP_INSTRUCTIONS}"
+    }
+
+    user_message = {
+        "role": "user",
+        "content": build_followup_questions_prompt(analysis)
+    }
+
+    return [system_message, user_message]
+
+
+def build_comparison_messages(analyses: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for comparing multiple submission analyses.
+
+    Args:
+        analyses: List of submission analysis dictionaries
+
+    Returns:
+        System and user messages for OpenAI
+    """
+    system_message = {
+        "role": "system",
+        "content": f"{_SYSTEM_PROMPT_STABLE}\n{COMPARISON_INSTRUCTIONS}"
+    }
+
+    user_message = {
+        "role": "user",
+        "content": build_comparison_prompt(analyses)
+    }
+
+    return [system_message, user_message]
+
+
+def _request_followup_questions(analysis: Dict[str, Any], use_cache: bool = True) -> Optional[str]:
+    """
+    Generate follow-up questions for a submission, or None if generation failed.
+
+    Args:
+        analysis: Dictionary containing submission analysis data
+        use_cache: Reuse questions already generated for an identical prompt
+
+    Returns:
+        Follow-up questions with explanations, or None if there was an error
+    """
+    messages = build_followup_questions_messages(analysis)
+    if use_cache:
+        cached = get_cached_followups(messages)
+        if cached is not None:
+            return cached
+
+    client = get_openai_client()
+
+    result = client.get_chat_completion(
+        messages=messages,
+        temperature=0.7,
+        max_tokens=1500,
+        use_cache=use_cache
+    )
+
+    if not result:
+        return None
+
+    store_followups(messages, result)
+    return result
+
+
+def generate_followup_questions(analysis: Dict[str, Any], use_cache: bool = True) -> str:
     """
     Generate tailored follow-up questions based on a submission analysis.
 
     Args:
         analysis: Dictionary containing submission analysis data
+        use_cache: Reuse questions already generated for an identical prompt
 
     Returns:
         List of follow-up questions with explanations
     """
-    client = AzureOpenAIClient()
-    prompt = build_followup_questions_prompt(analysis)
+    result = _request_followup_questions(analysis, use_cache=use_cache)
+    return result if result else "Failed to generate follow-up questions due to an error."
+
+
+def generate_followups_bulk(analyses: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Generate follow-up questions for several submissions concurrently.
+
+    Args:
+        analyses: List of submission analysis dictionaries
+
+    Returns:
+        Follow-up questions for each analysis, in the same order, with None
+        for any analysis whose questions could not be generated
+    """
+    if not analyses:
+        return []
+
+    max_workers = min(MAX_CONCURRENT_COMPLETIONS, len(analyses))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_request_followup_questions, analyses))
+
+
+def _split_batch_response(response: str, count: int) -> Dict[int, str]:
+    """
+    Split a batched follow-up response into per-submission blocks.
+
+    Args:
+        response: Model output containing "=== Submission k ===" delimited blocks
+        count: Number of submissions in the request
+
+    Returns:
+        Non-empty question blocks keyed by zero-based submission index
+    """
+    blocks = {}
+    parts = _BATCH_DELIMITER.split(response)
+
+    # parts alternates: preamble, number, block, number, block, ...
+    for number, block in zip(parts[1::2], parts[2::2]):
+        index = int(number) - 1
+        if 0 <= index < count and block.strip():
+            blocks[index] = block.strip()
+
+    return blocks
+
+
+def _request_followup_batch(analyses: List[Dict[str, Any]]) -> Dict[int, str]:
+    """
+    Generate follow-up questions for up to MAX_FOLLOWUP_BATCH_SIZE submissions in one request.
+
+    Args:
+        analyses: List of submission analysis dictionaries
+
+    Returns:
+        Question blocks keyed by position in analyses; submissions the
+        response did not cover are left out
+    """
+    token_budget = _analysis_token_budget(len(analyses))
+    user_prompt = ""
+    for number, analysis in enumerate(analyses, start=1):
+        submission_name = analysis.get("Submission Name", "Unnamed Submission")
+        analysis_text = _clip_to_tokens(extract_analysis_content(analysis), token_budget)
+        user_prompt += f"## Submission {number}: {submission_name}\n"
+        user_prompt += f"{analysis_text}\n\n"
 
     system_message = {
         "role": "system",
-        "content": "You are an AI assistant for the SoCa (Submission over Criteria) tool that helps prepare follow-up questions for submissions. Your questions should help gather additional information, clarify details, and better understand the submission's content. Be specific, professional, and conversational."
+        "content": f"{_SYSTEM_PROMPT_STABLE}\n{FOLLOWUP_INSTRUCTIONS}\n\n{FOLLOWUP_BATCH_INSTRUCTIONS}"
     }
 
     user_message = {
         "role": "user",
-        "content": prompt
+        "content": user_prompt
     }
 
-    result = client.get_chat_completion(
+    result = get_openai_client().get_chat_completion(
         messages=[system_message, user_message],
         temperature=0.7,
-        max_tokens=1500
+        max_tokens=FOLLOWUP_TOKENS_PER_SUBMISSION * len(analyses),
+        timeout=COMBINED_REQUEST_TIMEOUT
     )
 
-    return result if result else "Failed to generate follow-up questions due to an error."
+    return _split_batch_response(result or "", len(analyses))
 
 
-def summarize_submission_analyses(analyses: List[Dict[str, Any]]) -> str:
+def generate_followup_questions_batch(analyses: List[Dict[str, Any]]) -> List[Optional[str]]:
     """
-    Summarize multiple submission analyses using Azure OpenAI.
+    Generate follow-up questions for several submissions in as few requests as possible.
+
+    Submissions with cached questions are left out of the requests, the rest
+    are sent MAX_FOLLOWUP_BATCH_SIZE at a time, and submissions missing from
+    a batched response are generated individually. Batched output is not
+    written to the follow-up cache, which is keyed on single-submission
+    prompts.
 
     Args:
         analyses: List of submission analysis dictionaries
 
     Returns:
-        Comprehensive comparison of the submission analyses
+        Follow-up questions for each analysis, in the same order, with None
+        for any analysis whose questions could not be generated
     """
-    client = AzureOpenAIClient()
-    prompt = build_comparison_prompt(analyses)
+    questions: List[Optional[str]] = [
+        get_cached_followups(build_followup_questions_messages(analysis))
+        for analysis in analyses
+    ]
+
+    pending = [i for i, cached in enumerate(questions) if cached is None]
+    batches = [pending[start:start + MAX_FOLLOWUP_BATCH_SIZE]
+               for start in range(0, len(pending), MAX_FOLLOWUP_BATCH_SIZE)]
+
+    if batches:
+        max_workers = min(MAX_CONCURRENT_COMPLETIONS, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = executor.map(
+                _request_followup_batch, [[analyses[i] for i in batch] for batch in batches])
+            for batch, blocks in zip(batches, responses):
+                for position, block in blocks.items():
+                    questions[batch[position]] = block
+
+    # Fall back to individual requests for anything the batches did not cover
+    missing = [i for i in pending if questions[i] is None]
+    for i, generated in zip(missing, generate_followups_bulk([analyses[i] for i in missing])):
+        questions[i] = generated
+
+    return questions
+
+
+def _normalize_submission_name(name: str) -> str:
+    """Reduce a submission name to its case-insensitive file name without extension."""
+    return _SUBMISSION_EXTENSION.sub("", name.strip()).casefold()
+
+
+def summarize_and_generate_followups(analyses: List[Dict[str, Any]],
+                                     use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Generate the comparative summary and every submission's follow-up questions in one request.
+
+    Args:
+        analyses: List of submission analysis dictionaries
+        use_cache: Reuse output already generated for an identical prompt
+
+    Returns:
+        Dictionary with the comparative analysis ("summary") and follow-up
+        questions keyed by position in analyses ("followups"), or None if the
+        request failed, the reply was not valid JSON, or there are more than
+        MAX_COMBINED_SUBMISSIONS analyses for the reply to fit. Submissions
+        the reply did not cover, or whose name it cannot tell apart from
+        another submission's, are left out of "followups".
+    """
+    if not analyses or len(analyses) > MAX_COMBINED_SUBMISSIONS:
+        return None
+
+    client = get_openai_client()
 
     system_message = {
         "role": "system",
-        "content": "You are an AI assistant for the SoCa (Submission over Criteria) tool that helps compare and summarize multiple submission analyses. Provide objective, factual comparisons without ranking submissions or indicating which ones are better. Focus on highlighting differences in qualifications, skills, and experience without making value judgments."
+        "content": f"{_SYSTEM_PROMPT_STABLE}\n{COMPARISON_INSTRUCTIONS}\n\n"
+                   f"{FOLLOWUP_INSTRUCTIONS}\n\n{COMBINED_OUTPUT_INSTRUCTIONS}"
     }
 
     user_message = {
         "role": "user",
-        "content": prompt
+        "content": build_comparison_prompt(analyses)
     }
 
     result = client.get_chat_completion(
         messages=[system_message, user_message],
         temperature=0.7,
-        max_tokens=2000
+        max_tokens=COMBINED_SUMMARY_TOKENS + FOLLOWUP_TOKENS_PER_SUBMISSION * len(analyses),
+        use_cache=use_cache,
+        response_format={"type": "json_object"},
+        timeout=COMBINED_REQUEST_TIMEOUT
+    )
+
+    try:
+        output = orjson.loads(result)
+        summary = output["summary"]
+        followups = output.get("followups") or {}
+    except Exception:
+        return None
+
+    if not isinstance(summary, str) or not summary.strip() or not isinstance(followups, dict):
+        return None
+
+    # Match keys loosely in case the model still drops the extension or
+    # changes the case of a submission name. Names shared by several
+    # submissions cannot be matched to one of them, so they are left out.
+    positions: Dict[str, int] = {}
+    ambiguous = set()
+    for index, analysis in enumerate(analyses):
+        name = _normalize_submission_name(analysis.get("Submission Name", "Unnamed Submission"))
+        if name in positions:
+            ambiguous.add(name)
+        positions[name] = index
+
+    matched = {}
+    for key, questions in followups.items():
+        name = _normalize_submission_name(key)
+        if name in positions and name not in ambiguous \
+                and isinstance(questions, str) and questions.strip():
+            matched[positions[name]] = questions
+
+    return {
+        "summary": summary,
+        "followups": matched
+    }
+
+
+def stream_followup_questions(analysis: Dict[str, Any], use_cache: bool = True) -> Iterator[str]:
+    """
+    Stream tailored follow-up questions based on a submission analysis.
+
+    Args:
+        analysis: Dictionary containing submission analysis data
+        use_cache: Reuse questions already generated for an identical prompt
+
+    Yields:
+        Fragments of the follow-up questions as they are generated
+    """
+    messages = build_followup_questions_messages(analysis)
+    if use_cache:
+        cached = get_cached_followups(messages)
+        if cached is not None:
+            yield cached
+            return
+
+    client = get_openai_client()
+
+    questions = yield from client.stream_chat_completion(
+        messages=messages,
+        temperature=0.7,
+        max_tokens=1500,
+        use_cache=use_cache
+    )
+
+    if questions:
+        store_followups(messages, questions)
+
+
+def summarize_submission_analyses(analyses: List[Dict[str, Any]], use_cache: bool = True) -> str:
+    """
+    Summarize multiple submission analyses using Azure OpenAI.
+
+    Args:
+        analyses: List of submission analysis dictionaries
+        use_cache: Reuse a summary already generated for an identical prompt
+
+    Returns:
+        Comprehensive comparison of the submission analyses
+    """
+    client = get_openai_client()
+
+    result = client.get_chat_completion(
+        messages=build_comparison_messages(analyses),
+        temperature=0.7,
+        max_tokens=2000,
+        use_cache=use_cache
     )
 
     return result if result else "Failed to generate comparative analysis due to an error."
+
+
+def stream_submission_summary(analyses: List[Dict[str, Any]], use_cache: bool = True) -> Iterator[str]:
+    """
+    Stream a comparative summary of multiple submission analyses.
+
+    Args:
+        analyses: List of submission analysis dictionaries
+        use_cache: Reuse a summary already generated for an identical prompt
+
+    Yields:
+        Fragments of the comparative analysis as they are generated
+    """
+    client = get_openai_client()
+
+    yield from client.stream_chat_completion(
+        messages=build_comparison_messages(analyses),
+        temperature=0.7,
+        max_tokens=2000,
+        use_cache=use_cache
+    )
@@ -3,38 +3,114 @@ Functions for extracting text from various document types.
 """
 
 import os
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
 import docx2txt
-import pypdf
+import pymupdf
+import streamlit as st
+
+# Spreading PDF extraction over processes only pays off for huge documents;
+# below this page count, process start-up and data transfer cost more than
+# they save, so pages are extracted in-process.
+PDF_MULTIPROCESS_MIN_PAGES = 1000
+PDF_PAGES_PER_PROCESS = 500   # most pages handed to one worker at once
+
+# PyMuPDF is not thread-safe and can crash the interpreter when documents are
+# parsed concurrently, so all in-process PDF work is serialized on this lock.
+# Submissions are extracted from a thread pool; DOCX and text files, and the
+# API calls for earlier submissions, still run alongside.
+_PDF_LOCK = threading.Lock()
 
 
 def extract_text_from_file(uploaded_file) -> str:
     """Extract text content from various file types."""
+    return _extract_text_from_bytes(uploaded_file.getvalue(), uploaded_file.name)
+
+
+@st.cache_data(show_spinner=False, max_entries=100)
+def _extract_text_from_bytes(file_bytes: bytes, file_name: str) -> str:
+    """
+    Extract text content from raw file bytes.
+
+    Cached on the file content and name, so Streamlit reruns and repeated
+    analyses of the same upload skip document parsing entirely.
+    """
     try:
-        file_extension = os.path.splitext(uploaded_file.name)[1].lower()
+        file_extension = os.path.splitext(file_name)[1].lower()
 
         if file_extension == ".pdf":
-            return extract_text_from_pdf(uploaded_file)
+            return _extract_pdf_bytes(file_bytes)
         elif file_extension == ".docx":
-            return extract_text_from_docx(uploaded_file)
+            return _extract_docx_bytes(file_bytes)
         elif file_extension in [".txt", ".md", ".json"]:
-            return uploaded_file.getvalue().decode("utf-8")
+            return file_bytes.decode("utf-8")
         else:
             return f"Unsupported file type: {file_extension}"
     except Exception as e:
         return f"Error extracting text: {str(e)}"
 
 
+@lru_cache(maxsize=1)
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for parallel extraction of huge PDFs.
+
+    Each worker process has its own PyMuPDF state, so chunks of pages can be
+    extracted in parallel without _PDF_LOCK. Workers are spawned rather than
+    forked from the multi-threaded server.
+    """
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> str:
+    """Extract text from pages [start, stop) of a PDF document."""
+    with pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return "\n".join(doc[page_num].get_text("text") for page_num in range(start, stop))
+
+
+def _extract_multiprocess(pdf_bytes: bytes, page_count: int) -> str:
+    """Extract text from a huge PDF in page chunks across worker processes."""
+    # Give every CPU work, but keep chunks small enough to balance the load
+    chunk_size = min(PDF_PAGES_PER_PROCESS,
+                     math.ceil(page_count / (os.cpu_count() or 1)))
+    pool = _get_process_pool()
+    futures = [
+        pool.submit(_extract_page_range, pdf_bytes, start,
+                    min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+
+    return "\n".join(future.result() for future in futures)
+
+
 def extract_text_from_pdf(uploaded_file) -> str:
     """Extract text from PDF file."""
-    pdf_reader = pypdf.PdfReader(BytesIO(uploaded_file.getvalue()))
-    text = ""
-    for page_num in range(len(pdf_reader.pages)):
-        text += pdf_reader.pages[page_num].extract_text()
+    return _extract_pdf_bytes(uploaded_file.getvalue())
+
 
-    return text
+def _extract_pdf_bytes(pdf_bytes: bytes) -> str:
+    """
+    Extract text from PDF content, across processes for huge documents.
+
+    In-process parsing holds _PDF_LOCK, as PyMuPDF is not thread-safe.
+    """
+    with _PDF_LOCK, pymupdf.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_count = doc.page_count
+        if page_count < PDF_MULTIPROCESS_MIN_PAGES or (os.cpu_count() or 1) == 1:
+            return "\n".join(page.get_text("text") for page in doc)
+
+    return _extract_multiprocess(pdf_bytes, page_count)
 
 
 def extract_text_from_docx(uploaded_file) -> str:
     """Extract text from DOCX file."""
-    return docx2txt.process(BytesIO(uploaded_file.getvalue()))
+    return _extract_docx_bytes(uploaded_file.getvalue())
+
+
+def _extract_docx_bytes(docx_bytes: bytes) -> str:
+    """Extract text from DOCX content."""
+    return docx2txt.process(BytesIO(docx_bytes))
@@ -3,8 +3,9 @@ UI package for the CV Analysis Tool.
 Contains modules for UI components, main page, and sidebar.
 """
 
-from ui.components import create_download_link
+from ui.components import create_download_link, copy_button
 
 __all__ = [
-    'create_download_link'
+    'create_download_link',
+    'copy_button'
 ]
@@ -3,7 +3,10 @@ UI components and utilities for the CV Analysis Tool.
 """
 
 import base64
+import html
+import json
 import streamlit as st
+import streamlit.components.v1 as components
 from typing import Dict, Any
 
 
@@ -14,6 +17,19 @@ def create_download_link(content, filename, text):
     return href
 
 
+def copy_button(text: str, label: str = "📋 Copy Questions to Clipboard"):
+    """Render a button that copies text to the clipboard in the user's browser."""
+    # Escape the JSON-encoded text so it is safe inside the onclick attribute
+    js_text = html.escape(json.dumps(text), quote=True)
+    components.html(
+        f"""<button onclick="navigator.clipboard.writeText({js_text}).then(() => {{ this.innerText = '✅ Copied!'; }})"
+            style="padding: 0.4rem 0.8rem; border: 1px solid #ccc; border-radius: 0.5rem; background: white; cursor: pointer;">
+            {html.escape(label)}
+        </button>""",
+        height=45
+    )
+
+
 def process_api_response(response_data: Dict[str, Any]) -> str:
     """Process and format the API response for display."""
     try:
@@ -3,61 +3,170 @@ Main page UI logic for the SoCa (Submission over Criteria) Analysis Tool.
 """
 
 import streamlit as st
-import json
+import hashlib
+import os
+import queue
 import time
-import pandas as pd
-import pyperclip
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from typing import List, Dict, Any
 
-from services import APIClient, extract_text_from_file, summarize_submission_analyses
-from services.openai_client import generate_followup_questions
-from ui.components import display_feedback_buttons, create_download_link
+from config import AZURE_OPENAI_CONFIGURED, MAX_CONCURRENT_REQUESTS
+from services import (
+    analyze_submission,
+    extract_analysis_fields,
+    extract_text_from_file,
+    generate_followup_questions_batch,
+    stream_submission_summary,
+    stream_followup_questions,
+    summarize_and_generate_followups
+)
+from ui.components import display_feedback_buttons, create_download_link, copy_button
+
+
+def _analyze_extracted(index: int, extraction: Future) -> Dict[str, Any]:
+    """Send a submission's extracted text to the API for analysis."""
+    identifier = f"submission_{index+1}"
+    return analyze_submission(extraction.result(), identifier)
+
+
+def _analysis_key(result: Dict[str, Any]) -> str:
+    """Identify an analysis by the chat it was produced in, not by its file name."""
+    return f"{result['Thread ID']}:{result['Message ID']}"
+
+
+def _results_fingerprint(results: List[Dict[str, Any]]) -> str:
+    """Hash the identities of a set of analyses, independent of their order."""
+    analysis_ids = sorted(_analysis_key(r) for r in results)
+    return hashlib.sha256("|".join(analysis_ids).encode()).hexdigest()
 
 
 def process_submissions(uploaded_files) -> List[Dict[str, Any]]:
     """Process uploaded submission files and send them to the API for analysis."""
-    results = []
+    results_by_index = {}
+    total = len(uploaded_files)
+    completed = queue.Queue()
 
     with st.spinner("Analyzing Submissions..."):
         progress_bar = st.progress(0)
 
-        for i, uploaded_file in enumerate(uploaded_files):
-            # Update progress
-            progress = (i + 1) / len(uploaded_files)
-            progress_bar.progress(progress)
+        # Text extraction is CPU-bound and analysis is a blocking HTTP call, so
+        # run them in separate pools: later files are extracted while earlier
+        # ones are still waiting on the API. PDFs are parsed one at a time
+        # (PyMuPDF is not thread-safe; see services.text_extraction), while
+        # DOCX and text files are extracted alongside them.
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, total)) as api_pool, \
+                ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, total)) as extract_pool:
 
-            # Extract text
-            submission_text = extract_text_from_file(uploaded_file)
+            def submit_analysis(index: int, extraction: Future):
+                analysis = api_pool.submit(_analyze_extracted, index, extraction)
+                analysis.add_done_callback(lambda f: completed.put((index, f)))
 
-            # Send to API
-            identifier = f"submission_{i+1}"
-            response = APIClient.create_chat(
-                submission_text, identifier=identifier)
+            for i, uploaded_file in enumerate(uploaded_files):
+                extraction = extract_pool.submit(
+                    extract_text_from_file, uploaded_file)
+                extraction.add_done_callback(partial(submit_analysis, i))
 
-            # Log the response for debugging if needed
-            if "error" in response:
-                st.error(
-                    f"Error analyzing {uploaded_file.name}: {response['error']}")
-                continue
-
-            # Store result
-            result = {
-                "Submission Name": uploaded_file.name,
-                "Analysis": response.get("agent_response", "Analysis failed"),
-                "Thread ID": response.get("thread_id", ""),
-                "Message ID": response.get("message_id", "")
-            }
-            results.append(result)
-
-        # Reset summary state when processing new submissions
-        if 'summary_generated' in st.session_state:
+            for done in range(1, total + 1):
+                i, future = completed.get()
+                uploaded_file = uploaded_files[i]
+
+                # Update progress
+                progress_bar.progress(done / total)
+
+                try:
+                    response = future.result()
+                except Exception as e:
+                    response = {"error": str(e)}
+
+                # Log the response for debugging if needed
+                if "error" in response:
+                    st.error(
+                        f"Error analyzing {uploaded_file.name}: {response['error']}")
+                    continue
+
+                # Store result, parsing the analysis once so reruns reuse it
+                analysis = response.get("agent_response", "Analysis failed")
+                results_by_index[i] = {
+                    "Submission Name": uploaded_file.name,
+                    "Analysis": analysis,
+                    "Thread ID": response.get("thread_id", ""),
+                    "Message ID": response.get("message_id", ""),
+                    **extract_analysis_fields(analysis)
+                }
+
+        # Keep results in upload order regardless of completion order
+        results = [results_by_index[i] for i in sorted(results_by_index)]
+
+        # Reset summary and follow-up state only when the analyses themselves
+        # have changed, so questions for earlier uploads are not kept around
+        fingerprint = _results_fingerprint(results)
+        if st.session_state.get('summary_fingerprint') != fingerprint:
+            st.session_state['summary_fingerprint'] = fingerprint
             st.session_state['summary_generated'] = False
-            if 'summary_content' in st.session_state:
-                del st.session_state['summary_content']
+            st.session_state.pop('summary_content', None)
+            st.session_state['followup_questions'] = {}
+            st.session_state['followup_regenerate'] = set()
+            # Generated lazily by display_results, once the analyses are shown
+            st.session_state['combined_pending'] = True
+            st.session_state['followups_pending'] = True
 
     return results
 
 
+def _generate_summary_and_followups(results: List[Dict[str, Any]]) -> bool:
+    """
+    Request the comparative analysis and all follow-up questions together.
+
+    Seeds the session state read by the comparative analysis and follow-up
+    sections.
+
+    Returns:
+        True if the comparative analysis was generated
+    """
+    with st.spinner("Generating comparative analysis and follow-up questions..."):
+        output = summarize_and_generate_followups(results)
+
+    if output is None:
+        return False
+
+    st.session_state['summary_generated'] = True
+    st.session_state['summary_content'] = output['summary']
+    followups = st.session_state.setdefault('followup_questions', {})
+    for index, questions in output['followups'].items():
+        followups[_analysis_key(results[index])] = questions
+    return True
+
+
+def _fill_missing_followups(results: List[Dict[str, Any]]):
+    """
+    Generate follow-up questions in batched requests for submissions that have none.
+
+    Only successful results are stored, so failed submissions keep their
+    Generate button.
+    """
+    followups = st.session_state.setdefault('followup_questions', {})
+    missing = [r for r in results if _analysis_key(r) not in followups]
+    if not missing:
+        return
+
+    with st.spinner("Generating follow-up questions..."):
+        generated = generate_followup_questions_batch(missing)
+
+    failed = 0
+    for result, questions in zip(missing, generated):
+        if questions:
+            followups[_analysis_key(result)] = questions
+        else:
+            failed += 1
+
+    # Workers cannot show errors themselves, so report failures here
+    if failed:
+        st.warning(
+            f"Could not generate follow-up questions for {failed} submission(s). "
+            "Generate them individually below.")
+
+
 def display_results(results: List[Dict[str, Any]]):
     """Display the analysis results for the uploaded submissions."""
     if not results:
@@ -66,99 +175,85 @@ def display_results(results: List[Dict[str, Any]]):
     st.header("SoCa Analysis Results")
     st.markdown("*Submission over Criteria assessment*")
 
-    # Create tabs for each submission, a summary tab, and a follow-up questions tab
-    tab_names = [result["Submission Name"] for result in results] + \
-        ["🔍 Comparative Analysis", "🔗 Follow-up Questions"]
-    tabs = st.tabs(tab_names)
+    # Names are stored alongside the results so reruns need not rebuild them
+    submission_names = st.session_state.get('submission_names') or tuple(
+        result["Submission Name"] for result in results)
 
-    # Display individual submission tabs
-    # All tabs except the last two (comparative analysis and follow-up questions)
-    for i, tab in enumerate(tabs[:-2]):
-        with tab:
-            result = results[i]
+    # Render only the selected submission; tabs would render every
+    # submission's analysis on every rerun
+    # Select by position, as several uploads may share a file name
+    detail_index = st.selectbox(
+        "Submission", range(len(results)), format_func=lambda i: submission_names[i],
+        key="detail_submission_selector")
+    result = results[detail_index]
 
-            # Submission name and metadata
-            st.subheader(f"Submission: {result['Submission Name']}")
+    with st.container():
+        # Submission name and metadata
+        st.subheader(f"Submission: {result['Submission Name']}")
 
-            # Analysis result
-            st.markdown("### Analysis")
+        # Analysis result
+        st.markdown("### Analysis")
 
-            # Parse and display the analysis
-            try:
-                analysis_data = json.loads(result["Analysis"])
-                for header in analysis_data:
-                    chat_dict = header.get('__dict__', {})
-                    chat_name = chat_dict.get('chat_name', '')
-
-                    if chat_name in ["summary"]:
-                        chat_response = chat_dict.get('chat_response', {})
-                        chat_message = chat_response.get('chat_message', {})
-                        content = chat_message.get(
-                            '__dict__', {}).get('content', '')
-
-                        if content:
-                            st.markdown(content)
-            except Exception as e:
-                st.error(f"Error displaying analysis: {str(e)}")
-                st.markdown(result["Analysis"])
-
-            # Display feedback buttons
-            display_feedback_buttons(result, i)
-
-    # Check if we need to automatically generate a new summary
-    if not st.session_state.get('summary_generated', False) or 'summary_content' not in st.session_state:
-        # Generate the summary automatically when results are first displayed
-        try:
-            with st.spinner("Generating comparative analysis of all submissions..."):
-                # Check if OpenAI API credentials are configured
-                from config import AZURE_OPENAI_KEY, AZURE_OPENAI_ENDPOINT
-                if not AZURE_OPENAI_KEY or not AZURE_OPENAI_ENDPOINT:
-                    st.session_state['summary_generated'] = False
-                    st.session_state['summary_content'] = "⚠️ Azure OpenAI API credentials not configured. Please add them to your .env file to enable the comparative analysis feature."
-                else:
-                    # Generate summary using Azure OpenAI
-                    summary = summarize_submission_analyses(results)
+        # Display the summary extracted when the analysis was received
+        if result["SummaryMarkdown"]:
+            st.markdown(result["SummaryMarkdown"])
 
-                    # Store in session state
-                    st.session_state['summary_generated'] = True
-                    st.session_state['summary_content'] = summary
-        except Exception as e:
-            st.session_state['summary_generated'] = False
-            st.session_state[
-                'summary_content'] = f"⚠️ Error generating analysis: {str(e)}. Please check your Azure OpenAI API credentials."
+        # Display feedback buttons
+        display_feedback_buttons(result, detail_index)
 
-    # Display summary tab
-    with tabs[-2]:
+    # Display comparative analysis section
+    with st.expander("🔍 Comparative Analysis", expanded=True):
         st.subheader("Objective Comparative Analysis")
         st.markdown("*Comparing submissions against the defined criteria*")
 
-        # Display the summary (either newly generated or from cache)
-        st.markdown(st.session_state.get('summary_content', ''))
+        # Check if we need to automatically generate a new summary
+        needs_summary = not st.session_state.get(
+            'summary_generated', False) or 'summary_content' not in st.session_state
 
-        # Provide button to regenerate if needed
-        if st.button("Regenerate Analysis", key="regenerate_summary"):
-            with st.spinner("Regenerating comparative analysis..."):
-                try:
-                    # Check if OpenAI API credentials are configured
-                    from config import AZURE_OPENAI_KEY, AZURE_OPENAI_ENDPOINT
-                    if not AZURE_OPENAI_KEY or not AZURE_OPENAI_ENDPOINT:
-                        st.error(
-                            "Azure OpenAI API credentials not configured. Please add them to your .env file.")
-                    else:
-                        # Generate fresh summary using Azure OpenAI
-                        summary = summarize_submission_analyses(results)
+        if needs_summary:
+            if not AZURE_OPENAI_CONFIGURED:
+                st.session_state['summary_generated'] = False
+                st.session_state['summary_content'] = "⚠️ Azure OpenAI API credentials not configured. Please add them to your .env file to enable the comparative analysis feature."
+                needs_summary = False
 
-                        # Update session state
-                        st.session_state['summary_generated'] = True
-                        st.session_state['summary_content'] = summary
+        if needs_summary:
+            use_cache = st.session_state.pop('summary_use_cache', True)
 
-                        # Refresh the UI
-                        st.rerun()
-                except Exception as e:
-                    st.error(f"Error generating analysis: {str(e)}")
+            # For new results, try one request for the summary and every
+            # submission's follow-ups; the analyses above are already shown
+            if use_cache and st.session_state.pop('combined_pending', False):
+                needs_summary = not _generate_summary_and_followups(results)
 
-    # Display follow-up questions tab
-    with tabs[-1]:
+        if needs_summary:
+            # Stream the summary into the section as it is generated, reusing a
+            # cached summary of the same analyses unless regeneration was asked for
+            try:
+                summary = st.write_stream(
+                    stream_submission_summary(results, use_cache=use_cache))
+            except Exception as e:
+                summary = None
+                st.error(f"Error generating analysis: {str(e)}")
+
+            # Store in session state
+            st.session_state['summary_generated'] = bool(summary)
+            st.session_state['summary_content'] = summary or "⚠️ Error generating analysis. Please check your Azure OpenAI API credentials."
+        else:
+            # Display the summary from cache
+            st.markdown(st.session_state.get('summary_content', ''))
+
+        # Provide button to regenerate if needed
+        if st.button("Regenerate Analysis", key="regenerate_summary"):
+            if not AZURE_OPENAI_CONFIGURED:
+                st.error(
+                    "Azure OpenAI API credentials not configured. Please add them to your .env file.")
+            else:
+                # Drop the current summary so the next run streams a fresh one
+                st.session_state['summary_generated'] = False
+                st.session_state['summary_use_cache'] = False
+                st.rerun()
+
+    # Display follow-up questions section
+    with st.expander("🔗 Follow-up Questions", expanded=True):
         st.subheader("Generate Follow-up Questions")
         st.markdown("*Create targeted questions based on submission analysis*")
 
@@ -172,48 +267,54 @@ def display_results(results: List[Dict[str, Any]]):
         if 'followup_questions' not in st.session_state:
             st.session_state['followup_questions'] = {}
 
-        # Dropdown to select a submission
-        submission_options = [result["Submission Name"] for result in results]
-        selected_submission = st.selectbox(
-            "Select a Submission", submission_options, key="followup_submission_selector")
-
-        # Get the selected submission's index
-        selected_index = submission_options.index(selected_submission)
+        # For new results, generate the follow-ups the combined request did
+        # not cover, so selecting any submission shows its questions
+        if AZURE_OPENAI_CONFIGURED and st.session_state.pop('followups_pending', False):
+            _fill_missing_followups(results)
+
+        # Dropdown to select a submission; select by position so submissions
+        # with the same file name stay distinct
+        selected_index = st.selectbox(
+            "Select a Submission", range(len(results)),
+            format_func=lambda i: submission_names[i], key="followup_submission_selector")
+        selected_submission = submission_names[selected_index]
         selected_result = results[selected_index]
+        selected_key = _analysis_key(selected_result)
 
-        # Generate follow-up questions button
-        generate_button = st.button(
-            "Generate Follow-up Questions", type="primary", key="generate_questions")
+        # Questions are normally generated for every submission when the
+        # analysis completes; the button covers any that are missing
+        regenerate = st.session_state.setdefault('followup_regenerate', set())
+        regenerating = selected_key in regenerate
+        generate_button = False
+        if selected_key not in st.session_state['followup_questions'] and not regenerating:
+            generate_button = st.button(
+                "Generate Follow-up Questions", type="primary", key="generate_questions")
 
         # Check if we should display existing questions or generate new ones
-        if generate_button:
+        if generate_button or regenerating:
             try:
-                # Check if OpenAI API credentials are configured
-                from config import AZURE_OPENAI_KEY, AZURE_OPENAI_ENDPOINT
-                if not AZURE_OPENAI_KEY or not AZURE_OPENAI_ENDPOINT:
+                if not AZURE_OPENAI_CONFIGURED:
+                    regenerate.discard(selected_key)
                     st.error(
                         "Azure OpenAI API credentials not configured. Please add them to your .env file.")
                 else:
-                    # Generate follow-up questions using Azure OpenAI
-                    with st.spinner(f"Generating tailored follow-up questions for {selected_submission}..."):
-                        questions = generate_followup_questions(
-                            selected_result)
+                    # Stream follow-up questions from Azure OpenAI, bypassing the
+                    # cache if the user asked to regenerate this submission's questions
+                    use_cache = not regenerating
+                    regenerate.discard(selected_key)
 
-                        # Store in session state with submission name as key
-                        st.session_state['followup_questions'][selected_submission] = questions
+                    st.markdown("### Tailored Follow-up Questions")
+                    questions = st.write_stream(
+                        stream_followup_questions(selected_result, use_cache=use_cache))
 
-                        # Display the questions
-                        st.markdown("### Tailored Follow-up Questions")
-                        st.markdown(questions)
+                    if not questions:
+                        st.error("Failed to generate follow-up questions due to an error.")
+                    else:
+                        # Store in session state under the analysis it was generated for
+                        st.session_state['followup_questions'][selected_key] = questions
 
                         # Add copy to clipboard functionality
-                        if st.button("📋 Copy Questions to Clipboard", key="copy_questions"):
-                            try:
-                                pyperclip.copy(questions)
-                                st.success("Questions copied to clipboard!")
-                            except Exception:
-                                st.error(
-                                    "Unable to copy to clipboard. Please select and copy manually.")
+                        copy_button(questions)
 
                         # Add export functionality
                         export_questions = create_download_link(
@@ -224,35 +325,27 @@ def display_results(results: List[Dict[str, Any]]):
                         st.markdown(export_questions, unsafe_allow_html=True)
             except Exception as e:
                 st.error(f"Error generating follow-up questions: {str(e)}")
-        elif selected_submission in st.session_state['followup_questions']:
+        elif selected_key in st.session_state['followup_questions']:
             # Display existing questions from session state
             st.markdown("### Tailored Follow-up Questions")
             st.markdown(
-                st.session_state['followup_questions'][selected_submission])
+                st.session_state['followup_questions'][selected_key])
 
             # Add copy to clipboard functionality
-            if st.button("📋 Copy Questions to Clipboard", key="copy_existing_questions"):
-                try:
-                    pyperclip.copy(
-                        st.session_state['followup_questions'][selected_submission])
-                    st.success("Questions copied to clipboard!")
-                except Exception:
-                    st.error(
-                        "Unable to copy to clipboard. Please select and copy manually.")
+            copy_button(
+                st.session_state['followup_questions'][selected_key])
 
             # Add export functionality
             export_questions = create_download_link(
-                st.session_state['followup_questions'][selected_submission],
+                st.session_state['followup_questions'][selected_key],
                 f"followup_questions_{selected_submission.replace(' ', '_')}.txt",
                 "📥 Download Questions as Text File"
             )
             st.markdown(export_questions, unsafe_allow_html=True)
 
-            # Add regenerate button
+            # Add regenerate button; the next run streams fresh questions
             if st.button("🔄 Regenerate Questions", key="regenerate_questions"):
-                # Remove existing questions to force regeneration
-                if selected_submission in st.session_state['followup_questions']:
-                    del st.session_state['followup_questions'][selected_submission]
+                regenerate.add(selected_key)
                 st.rerun()
         else:
             st.info(
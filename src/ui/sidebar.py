@@ -3,13 +3,37 @@ Sidebar UI components for the SoCa (Submission over Criteria) Analysis Tool.
 """
 
 import streamlit as st
-import pandas as pd
+import csv
+import io
 import json
 from typing import Dict, Any, Tuple, List, Optional
 
-from services import extract_text_from_file
+from services import analyze_submission, extract_text_from_file
 from utils.helpers import convert_text_to_job_criteria_json, update_job_criteria_in_azure
 
+# Result fields included in the CSV export
+EXPORT_COLUMNS = ["Submission Name", "Analysis", "Thread ID", "Message ID"]
+
+
+@st.cache_data(show_spinner=False, max_entries=10)
+def _results_csv(rows: Tuple[Tuple[Any, ...], ...]) -> bytes:
+    """
+    Encode exported result rows as CSV.
+
+    Cached so reruns with unchanged results do not rebuild the CSV.
+
+    Args:
+        rows: One tuple of EXPORT_COLUMNS values per result
+
+    Returns:
+        UTF-8 encoded CSV with a header row
+    """
+    buffer = io.StringIO(newline="")
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(dict(zip(EXPORT_COLUMNS, row)) for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
 
 def render_sidebar():
     """Render the sidebar UI components and handle sidebar interactions."""
@@ -41,6 +65,8 @@ def render_sidebar():
         if st.sidebar.button("Update Criteria", key="update_criteria"):
             with st.spinner("Updating criteria..."):
                 if update_job_criteria_in_azure(job_criteria):
+                    # Cached analyses were made against the old criteria
+                    analyze_submission.clear()
                     st.sidebar.success("Criteria updated successfully!")
                 else:
                     st.sidebar.error(
@@ -53,8 +79,9 @@ def render_sidebar():
     if st.session_state.get('analysis_completed'):
         export_results = st.sidebar.download_button(
             label="Export Results as CSV",
-            data=pd.DataFrame(st.session_state.get(
-                'results', [])).to_csv(index=False),
+            data=_results_csv(tuple(
+                tuple(result.get(column) for column in EXPORT_COLUMNS)
+                for result in st.session_state.get('results', []))),
             file_name="submission_analysis_results.csv",
             mime="text/csv"
         )
@@ -63,6 +90,7 @@ def render_sidebar():
             st.session_state['analysis_completed'] = False
             st.session_state['results'] = []
             st.session_state['thread_ids'] = []
+            st.session_state['submission_names'] = ()
             st.rerun()
 
     # Separator before information section